@@ -12,12 +12,7 @@ from flask import Flask, render_template
 
 from config import config
 from extensions import db, login_manager, csrf, limiter, migrate
-from db_maintenance import (
-    ensure_team_national_title_odds_column,
-    ensure_user_is_admin_column,
-    ensure_user_display_name_column,
-    ensure_game_automation_columns,
-)
+from db_maintenance import ensure_legacy_schema
 
 
 def create_app(config_name=None):
@@ -49,10 +44,7 @@ def create_app(config_name=None):
         return db.session.get(User, int(user_id))
 
     # ── Schema migrations ────────────────────────────────────────────────
-    ensure_team_national_title_odds_column(app, db, reporter=app.logger.info)
-    ensure_user_is_admin_column(app, db, reporter=app.logger.info)
-    ensure_user_display_name_column(app, db, reporter=app.logger.info)
-    ensure_game_automation_columns(app, db, reporter=app.logger.info)
+    ensure_legacy_schema(app, db, reporter=app.logger.info)
 
     # ── Blueprints ───────────────────────────────────────────────────────
     from routes.auth import auth_bp
@@ -67,17 +59,20 @@ def create_app(config_name=None):
     from timezone_utils import format_deadline, to_pool_time, get_current_time, POOL_TZ_NAME
     from display_utils import get_display_helpers
 
+    # Built once: every value is a function or a fixed setting, and Flask
+    # copies processor results into the template context rather than mutating them
+    template_helpers = {
+        'format_deadline': format_deadline,
+        'to_pool_time': to_pool_time,
+        'get_current_time': get_current_time,
+        'timezone': POOL_TZ_NAME,
+        'entry_fee': app.config.get('ENTRY_FEE', 25),
+    }
+    template_helpers.update(get_display_helpers())
+
     @app.context_processor
     def inject_helpers():
-        helpers = {
-            'format_deadline': format_deadline,
-            'to_pool_time': to_pool_time,
-            'get_current_time': get_current_time,
-            'timezone': POOL_TZ_NAME,
-            'entry_fee': app.config.get('ENTRY_FEE', 25),
-        }
-        helpers.update(get_display_helpers())
-        return helpers
+        return template_helpers
 
     # ── Error handlers ───────────────────────────────────────────────────
     @app.errorhandler(404)
@@ -102,7 +97,7 @@ def create_app(config_name=None):
     def cfb_sync_command(mode):
         """Unified CFB automation CLI — run weekly tasks by mode."""
         from services.automation import run_setup, run_spread_update, run_scores, run_status
-        from services.game_logic import check_and_process_autopicks
+        from services.game_logic import check_and_process_autopicks, refresh_cumulative_spreads
 
         if mode == 'setup':
             result = run_setup()
@@ -112,6 +107,7 @@ def create_app(config_name=None):
             result = run_scores()
         elif mode == 'autopick':
             results = check_and_process_autopicks()
+            refresh_cumulative_spreads()
             result = {
                 'status': 'processed',
                 'details': '\n'.join(results) if results else 'No auto-picks needed',
@@ -3,12 +3,16 @@ Database Backup System for CFB Survivor Pool
 Creates organized, timestamped backups with metadata and restore capabilities.
 """
 
+import hashlib
 import json
 import logging
 import os
 import shutil
+import sqlite3
 import sys
 
+from sqlalchemy import case, func, select
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
@@ -45,27 +49,58 @@ class DatabaseBackupManager:
         else:
             self.db_file = os.path.join(BASE_DIR, 'picks.db')
 
+    def _release_connections(self):
+        """Close pooled connections so no handle stays open on the database file."""
+        with app.app_context():
+            db.engine.dispose()
+
+    def _snapshot(self, dst_path):
+        """Copy the live database to dst_path with SQLite's online backup API.
+
+        Unlike a plain file copy, this yields a transactionally consistent
+        snapshot even if the app writes to the database mid-copy.
+        """
+        src = sqlite3.connect(self.db_file)
+        try:
+            dst = sqlite3.connect(dst_path)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+        finally:
+            src.close()
+
+    @staticmethod
+    def _sha256(path):
+        """Return the hex SHA-256 digest of a file."""
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
     def get_pool_stats(self):
         """Gather current statistics about the pool."""
         with app.app_context():
+            # All row counts in one SELECT
+            total_users, active_users, eliminated_users, total_games, total_picks = db.session.query(
+                func.count(User.id),
+                func.count(case((User.is_eliminated == False, 1))),  # noqa: E712
+                func.count(case((User.is_eliminated == True, 1))),  # noqa: E712
+                select(func.count(Game.id)).scalar_subquery(),
+                select(func.count(Pick.id)).scalar_subquery(),
+            ).one()
+            # The week table is tiny: read it once and derive the week fields
+            weeks = db.session.query(Week.week_number, Week.is_active, Week.is_complete).all()
+
             stats = {
-                'total_users': User.query.count(),
-                'active_users': User.query.filter_by(is_eliminated=False).count(),
-                'eliminated_users': User.query.filter_by(is_eliminated=True).count(),
-                'total_weeks': Week.query.count(),
-                'total_games': Game.query.count(),
-                'total_picks': Pick.query.count(),
-                'current_week': None,
-                'completed_weeks': [],
+                'total_users': total_users,
+                'active_users': active_users,
+                'eliminated_users': eliminated_users,
+                'total_weeks': len(weeks),
+                'total_games': total_games,
+                'total_picks': total_picks,
+                'current_week': next((w.week_number for w in weeks if w.is_active), None),
+                'completed_weeks': [w.week_number for w in weeks if w.is_complete],
             }
 
-            current_week = Week.query.filter_by(is_active=True).first()
-            if current_week:
-                stats['current_week'] = current_week.week_number
-
-            completed = Week.query.filter_by(is_complete=True).all()
-            stats['completed_weeks'] = [w.week_number for w in completed]
-
             leader = User.query.filter_by(is_eliminated=False).order_by(
                 User.lives_remaining.desc(),
                 User.cumulative_spread.desc(),
@@ -90,7 +125,9 @@ class DatabaseBackupManager:
         Returns:
             Path to the created backup, or None on failure.
         """
-        timestamp = get_current_time().strftime('%Y%m%d_%H%M%S')
+        # One clock reading so the filename and readable_time always agree
+        now = get_current_time()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         stats = self.get_pool_stats()
         week_num = stats.get('current_week', 0)
 
@@ -113,16 +150,26 @@ class DatabaseBackupManager:
             return None
 
         try:
-            shutil.copy2(self.db_file, backup_path)
+            try:
+                self._snapshot(backup_path)
+            except sqlite3.DatabaseError as exc:
+                # Only "file is not a database" raises the base class; I/O,
+                # disk-full and open failures are subclasses and must not be
+                # papered over with a plain copy of a possibly mid-write file.
+                if type(exc) is not sqlite3.DatabaseError:
+                    raise
+                logger.warning("%s is not a SQLite database (%s); copying the file instead.", self.db_file, exc)
+                shutil.copy2(self.db_file, backup_path)
 
             metadata = {
                 'backup_type': backup_type,
                 'timestamp': timestamp,
                 'timezone': POOL_TZ_NAME,
-                'readable_time': get_current_time().strftime('%B %d, %Y at %I:%M %p %Z'),
+                'readable_time': now.strftime('%B %d, %Y at %I:%M %p %Z'),
                 'description': description,
                 'filename': filename,
                 'file_size_mb': round(os.path.getsize(backup_path) / (1024 * 1024), 2),
+                'sha256': self._sha256(backup_path),
                 'pool_stats': stats,
             }
 
@@ -150,7 +197,10 @@ class DatabaseBackupManager:
         total_backups = 0
 
         for type_name, directory in dirs_to_check:
-            backups = [f for f in os.listdir(directory) if f.endswith('.db')]
+            # One directory read answers both "which backups" and "has metadata"
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+            backups = [f for f in names if f.endswith('.db')]
             if not backups:
                 continue
 
@@ -160,10 +210,9 @@ class DatabaseBackupManager:
             for backup in sorted(backups, reverse=True):
                 total_backups += 1
                 metadata_file = backup.replace('.db', '.json')
-                metadata_path = os.path.join(directory, metadata_file)
 
-                if os.path.exists(metadata_path):
-                    with open(metadata_path, 'r') as f:
+                if metadata_file in names:
+                    with open(os.path.join(directory, metadata_file), 'r') as f:
                         metadata = json.load(f)
                     print(f'\n  {backup}')
                     print(f"    Created: {metadata.get('readable_time', 'Unknown')}")
@@ -185,9 +234,10 @@ class DatabaseBackupManager:
         """Calculate total size of all backups in MB."""
         total_size = 0
         for directory in [self.weekly_dir, self.manual_dir, self.auto_dir]:
-            for file in os.listdir(directory):
-                if file.endswith('.db'):
-                    total_size += os.path.getsize(os.path.join(directory, file))
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.db'):
+                        total_size += entry.stat().st_size
         return total_size / (1024 * 1024)
 
     def restore_backup(self, backup_filename):
@@ -206,6 +256,20 @@ class DatabaseBackupManager:
             logger.error("Backup file '%s' not found!", backup_filename)
             return False
 
+        metadata = None
+        metadata_file = backup_filename.replace('.db', '.json')
+        metadata_path = os.path.join(os.path.dirname(backup_path), metadata_file)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+
+        # Verify before taking the safety backup so a bad file costs nothing.
+        # Older backups predate checksums; only verify when one was recorded.
+        expected = metadata.get('sha256') if metadata else None
+        if expected and self._sha256(backup_path) != expected:
+            logger.error("Backup '%s' does not match its checksum. Restore cancelled.", backup_filename)
+            return False
+
         logger.info("Creating safety backup of current database...")
         safety_backup = self.create_backup('manual', 'Pre-restore safety backup')
         if not safety_backup:
@@ -215,11 +279,7 @@ class DatabaseBackupManager:
         print(f'\nWARNING: This will replace your current database!')
         print(f'Restoring from: {backup_filename}')
 
-        metadata_file = backup_filename.replace('.db', '.json')
-        metadata_path = os.path.join(os.path.dirname(backup_path), metadata_file)
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+        if metadata:
             print(f"Backup created: {metadata.get('readable_time', 'Unknown')}")
             print(f"Description: {metadata.get('description', 'None')}")
 
@@ -228,14 +288,18 @@ class DatabaseBackupManager:
             print('Restore cancelled.')
             return False
 
+        self._release_connections()
+
+        # copyfile takes the kernel's in-place copy path and leaves the live
+        # file's own timestamps alone; the backup's age is in its metadata
         try:
-            shutil.copy2(backup_path, self.db_file)
+            shutil.copyfile(backup_path, self.db_file)
             logger.info("Database restored from %s", backup_filename)
             return True
         except Exception as e:
             logger.error("Restore failed: %s", e)
             try:
-                shutil.copy2(safety_backup, self.db_file)
+                shutil.copyfile(safety_backup, self.db_file)
                 logger.info("Safety backup restored.")
             except Exception:
                 logger.critical("Could not restore safety backup at: %s", safety_backup)
@@ -251,17 +315,18 @@ class DatabaseBackupManager:
 
         total_removed = 0
         for directory, keep_count, backup_type in cleanup_configs:
-            backups = sorted(f for f in os.listdir(directory) if f.endswith('.db'))
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+            backups = sorted(f for f in names if f.endswith('.db'))
             if len(backups) <= keep_count:
                 continue
 
             for backup in backups[:-keep_count]:
-                backup_path = os.path.join(directory, backup)
-                metadata_path = backup_path.replace('.db', '.json')
+                metadata_file = backup.replace('.db', '.json')
                 try:
-                    os.remove(backup_path)
-                    if os.path.exists(metadata_path):
-                        os.remove(metadata_path)
+                    os.remove(os.path.join(directory, backup))
+                    if metadata_file in names:
+                        os.remove(os.path.join(directory, metadata_file))
                     logger.info("Removed old %s backup: %s", backup_type, backup)
                     total_removed += 1
                 except Exception as e:
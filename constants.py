@@ -11,6 +11,11 @@ from fbs_master_teams import (
     SHORT_TO_API,
 )
 
+# Conferences that crown a champion (Week 15 coverage), sorted for display
+CHAMPIONSHIP_CONFERENCES = tuple(sorted(
+    {conf for conf in TEAM_CONFERENCES.values() if conf != 'Independent'}
+))
+
 # The Odds API sport key for NCAAF
 SPORT_KEY = 'americanfootball_ncaaf'
 
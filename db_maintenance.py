@@ -1,35 +1,62 @@
 """Utilities for one-off database schema maintenance."""
 
 import logging
-
-from sqlalchemy import inspect, text
-from sqlalchemy.exc import NoSuchTableError
+import sqlite3
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Stamped into PRAGMA user_version once the legacy column checks below have
+# passed. The set is closed: new schema changes go through Alembic migrations.
+LEGACY_SCHEMA_VERSION = 1
 
-def _ensure_column(app, db, table, column, col_type, *, reporter=None):
-    """Generic helper to add a column if it doesn't exist."""
-    report = reporter or logger.info
 
-    with app.app_context():
-        inspector = inspect(db.engine)
-        try:
-            columns = {col["name"] for col in inspector.get_columns(table)}
-        except NoSuchTableError:
-            report(f"{table} table does not exist yet; skipping {column} check.")
-            return False
+@contextmanager
+def _raw_cursor(db):
+    """Yield a DB-API cursor on a pooled connection, committing on success."""
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        yield cursor
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
 
-        if column in columns:
-            return True
+def _ensure_column(app, db, table, column, col_type, *, backfill=None, reporter=None):
+    """Generic helper to add a column if it doesn't exist.
 
-        report(f"Adding {column} column to {table} table...")
+    When the column is added, the optional ``backfill`` statement runs in the
+    same transaction so the schema change and data fix commit together.
+    """
+    report = reporter or logger.info
+
+    with app.app_context():
         try:
-            with db.engine.begin() as conn:
-                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
-        except Exception as exc:
-            report(f"Failed to add {column} column: {exc}")
-            return False
+            with _raw_cursor(db) as cursor:
+                cursor.execute(f"PRAGMA table_info({table})")
+                columns = {row[1] for row in cursor.fetchall()}
+
+                if not columns:
+                    report(f"{table} table does not exist yet; skipping {column} check.")
+                    return False
+
+                if column in columns:
+                    return True
+
+                report(f"Adding {column} column to {table} table...")
+                statements = [f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"]
+                if backfill:
+                    statements.append(backfill)
+                cursor.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
+        except sqlite3.OperationalError as exc:
+            # Another worker added the column between our check and ALTER.
+            if "duplicate column" not in str(exc).lower():
+                raise
+            report(f"{column} column already added to {table} table.")
 
         return True
 
@@ -41,45 +68,51 @@ def ensure_team_national_title_odds_column(app, db, *, reporter=None):
 
 def ensure_user_is_admin_column(app, db, *, reporter=None):
     """Ensure the User table has an is_admin column and set B1G_Brad as admin."""
-    report = reporter or logger.info
-    added = _ensure_column(app, db, "user", "is_admin", "BOOLEAN DEFAULT 0", reporter=reporter)
-
-    if added:
-        with app.app_context():
-            try:
-                with db.engine.begin() as conn:
-                    conn.execute(text(
-                        "UPDATE user SET is_admin = 1 WHERE username IN ('admin', 'B1G_Brad')"
-                    ))
-                report("Set is_admin=True for admin accounts.")
-            except Exception as exc:
-                report(f"Failed to set admin flags: {exc}")
-
-    return added
+    return _ensure_column(
+        app, db, "user", "is_admin", "BOOLEAN DEFAULT 0",
+        backfill="UPDATE user SET is_admin = 1 WHERE username IN ('admin', 'B1G_Brad')",
+        reporter=reporter,
+    )
 
 
 def ensure_user_display_name_column(app, db, *, reporter=None):
     """Ensure the User table has a display_name column and seed admin display name."""
-    report = reporter or logger.info
-    added = _ensure_column(app, db, "user", "display_name", "VARCHAR(80)", reporter=reporter)
-
-    if added:
-        with app.app_context():
-            try:
-                with db.engine.begin() as conn:
-                    conn.execute(text(
-                        "UPDATE user SET display_name = 'B1G_Brad' WHERE username = 'admin' AND display_name IS NULL"
-                    ))
-                report("Seeded display_name for admin account.")
-            except Exception as exc:
-                report(f"Failed to seed display_name: {exc}")
-
-    return added
+    return _ensure_column(
+        app, db, "user", "display_name", "VARCHAR(80)",
+        backfill="UPDATE user SET display_name = 'B1G_Brad' WHERE username = 'admin'",
+        reporter=reporter,
+    )
 
 
 def ensure_game_automation_columns(app, db, *, reporter=None):
     """Ensure the Game table has columns for automation (scores, event ID, spread lock)."""
-    _ensure_column(app, db, "game", "api_event_id", "VARCHAR(64)", reporter=reporter)
-    _ensure_column(app, db, "game", "home_score", "INTEGER", reporter=reporter)
-    _ensure_column(app, db, "game", "away_score", "INTEGER", reporter=reporter)
-    _ensure_column(app, db, "game", "spread_locked_at", "DATETIME", reporter=reporter)
+    results = [
+        _ensure_column(app, db, "game", "api_event_id", "VARCHAR(64)", reporter=reporter),
+        _ensure_column(app, db, "game", "home_score", "INTEGER", reporter=reporter),
+        _ensure_column(app, db, "game", "away_score", "INTEGER", reporter=reporter),
+        _ensure_column(app, db, "game", "spread_locked_at", "DATETIME", reporter=reporter),
+    ]
+    return all(results)
+
+
+def ensure_legacy_schema(app, db, *, reporter=None):
+    """Run every legacy column check unless PRAGMA user_version says they already passed."""
+    with app.app_context():
+        with _raw_cursor(db) as cursor:
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= LEGACY_SCHEMA_VERSION:
+                return True
+
+    results = [
+        ensure_team_national_title_odds_column(app, db, reporter=reporter),
+        ensure_user_is_admin_column(app, db, reporter=reporter),
+        ensure_user_display_name_column(app, db, reporter=reporter),
+        ensure_game_automation_columns(app, db, reporter=reporter),
+    ]
+    if not all(results):
+        return False
+
+    with app.app_context():
+        with _raw_cursor(db) as cursor:
+            cursor.execute(f"PRAGMA user_version = {LEGACY_SCHEMA_VERSION}")
+    return True
@@ -3,6 +3,13 @@ Display utilities for consistent week name formatting across the app
 Handles both regular season and playoff week displays, plus CFP elimination tracking
 """
 
+from flask import g, has_request_context
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from models import Game, Week, Team, Pick
+
+
 def get_week_display_name(week):
     """
     Get the full display name for a week
@@ -22,7 +29,7 @@ def get_week_display_name(week):
         return "Unknown Week"
     
     # Check if week has a custom round_name set
-    if hasattr(week, 'round_name') and week.round_name:
+    if week.round_name:
         return week.round_name
     
     # Default to "Week X" for weeks without custom names
@@ -48,7 +55,7 @@ def get_week_short_label(week):
         return "?"
     
     # Check if it has a custom round_name
-    if hasattr(week, 'round_name') and week.round_name:
+    if week.round_name:
         round_name = week.round_name
         
         # Map full names to short labels
@@ -96,17 +103,21 @@ def get_cfp_eliminated_teams():
     A team is eliminated if they lost in any game during a playoff week 
     where results have been recorded.
     
+    Memoized on flask.g for the rest of the request, since templates and
+    routes may ask for it several times per render.
+    
     Returns:
         set: Set of eliminated team names
     """
-    # Import here to avoid circular imports
-    from extensions import db
-    from models import Game, Week, Team
+    if has_request_context() and 'cfp_eliminated_teams' in g:
+        return g.cfp_eliminated_teams
     
     eliminated = set()
     
     # Get all playoff weeks with completed games
-    playoff_games = db.session.query(Game).join(Week).filter(
+    playoff_games = db.session.query(Game).join(Week).options(
+        joinedload(Game.home_team), joinedload(Game.away_team),
+    ).filter(
         Week.is_playoff_week == True,
         Game.home_team_won != None  # Result has been recorded
     ).all()
@@ -125,6 +136,8 @@ def get_cfp_eliminated_teams():
             elif game.home_team_name:
                 eliminated.add(game.home_team_name)
     
+    if has_request_context():
+        g.cfp_eliminated_teams = eliminated
     return eliminated
 
 
@@ -154,12 +167,11 @@ def get_cfp_teams_in_week(week):
     if not week:
         return set()
     
-    # Import here to avoid circular imports
-    from models import Game
-    
     teams_playing = set()
     
-    games = Game.query.filter_by(week_id=week.id).all()
+    games = Game.query.options(
+        joinedload(Game.home_team), joinedload(Game.away_team),
+    ).filter_by(week_id=week.id).all()
     
     for game in games:
         if game.home_team:
@@ -214,19 +226,15 @@ def get_cfp_available_teams_for_user(user_id, week):
     if not week:
         return []
     
-    # Import here to avoid circular imports
-    from extensions import db
-    from models import Team, Pick, Week as WeekModel
-    
     # Get base sets
     playoff_team_names = set(get_playoff_teams())
     eliminated_names = get_cfp_eliminated_teams()
     teams_playing_names = get_cfp_teams_in_week(week)
     
     # Get teams user has already picked in CFP
-    used_in_cfp = db.session.query(Pick.team_id).join(WeekModel).filter(
+    used_in_cfp = db.session.query(Pick.team_id).join(Week).filter(
         Pick.user_id == user_id,
-        WeekModel.is_playoff_week == True,
+        Week.is_playoff_week == True,
         Pick.week_id != week.id  # Exclude current week
     ).all()
     used_team_ids = {t[0] for t in used_in_cfp}
@@ -270,12 +278,7 @@ def is_week_playoff(week):
     if not week:
         return False
     
-    # Check the is_playoff_week flag
-    if hasattr(week, 'is_playoff_week'):
-        return week.is_playoff_week
-    
-    # Fallback: check week number (16+ are playoffs)
-    return week.week_number >= 16
+    return week.is_playoff_week
 
 
 def format_week_for_title(week):
@@ -0,0 +1,24 @@
+"""add lower(username) index
+
+Revision ID: 4c1d2e7a9b30
+Revises: 882230eb20f7
+Create Date: 2026-10-15 09:12:04.518330
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c1d2e7a9b30'
+down_revision = '882230eb20f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_username_lower', 'user', [sa.text('lower(username)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_username_lower', table_name='user')
@@ -11,7 +11,6 @@ from sqlalchemy import or_
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from extensions import db
-from timezone_utils import deadline_has_passed
 from constants import TEAM_CONFERENCES
 
 
@@ -31,48 +30,15 @@ class User(UserMixin, db.Model):
 
     picks = db.relationship('Pick', backref='user', lazy=True)
 
+    # Login, register and the standings sort all match on lower(username)
+    __table_args__ = (db.Index('ix_user_username_lower', db.func.lower(username)),)
+
     def set_password(self, password):
         self.password = generate_password_hash(password)
 
     def check_password(self, password):
         return check_password_hash(self.password, password)
 
-    def calculate_cumulative_spread(self):
-        """Calculate cumulative spread using a single joined query."""
-        results = (
-            db.session.query(Pick, Game)
-            .join(Week, Pick.week_id == Week.id)
-            .join(
-                Game,
-                db.and_(
-                    Game.week_id == Pick.week_id,
-                    db.or_(
-                        Game.home_team_id == Pick.team_id,
-                        Game.away_team_id == Pick.team_id,
-                    ),
-                ),
-            )
-            .filter(Pick.user_id == self.id)
-            .all()
-        )
-
-        total = 0.0
-        for pick, game in results:
-            if not deadline_has_passed(pick.week.deadline):
-                continue
-            if pick.team_id == game.home_team_id:
-                team_spread = game.home_team_spread
-            else:
-                team_spread = -game.home_team_spread
-            # Favorites add positive, underdogs subtract
-            if team_spread < 0:
-                total += abs(team_spread)
-            else:
-                total -= team_spread
-
-        self.cumulative_spread = total
-        return total
-
     @property
     def display_name(self):
         return self._display_name or self.username
@@ -133,6 +99,10 @@ class Game(db.Model):
     home_team = db.relationship('Team', foreign_keys=[home_team_id], backref='home_games')
     away_team = db.relationship('Team', foreign_keys=[away_team_id], backref='away_games')
 
+    # Every game lookup is scoped to a week. A single-column index keeps rows
+    # in insertion order for the unordered week listings.
+    __table_args__ = (db.Index('ix_game_week_id', 'week_id'),)
+
     def get_home_team_display(self):
         return self.home_team.name if self.home_team else self.home_team_name
 
@@ -164,7 +134,12 @@ class Pick(db.Model):
     week = db.relationship('Week', backref='picks')
     team = db.relationship('Team', backref='picks')
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'week_id'),)
+    # The unique constraint already indexes (user_id, week_id); week-wide
+    # pick scans need their own index on week_id.
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'week_id'),
+        db.Index('ix_pick_week_id', 'week_id'),
+    )
 
     def __repr__(self):
         return f'<Pick user={self.user_id} week={self.week_id}>'
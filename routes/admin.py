@@ -8,15 +8,16 @@ import logging
 from datetime import datetime
 from functools import wraps
 
-from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 
 from extensions import db
 from models import User, Team, Week, Game, Pick
 from constants import FBS_MASTER_TEAMS, TEAM_CONFERENCES
 from timezone_utils import get_current_time, make_aware, parse_form_datetime
 from services.game_logic import process_week_results, process_autopicks
+from services.score_fetcher import ScoreFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -103,9 +104,9 @@ def create_week():
 @admin_bp.route('/week/<int:week_id>/activate', methods=['POST'])
 @admin_required
 def activate_week(week_id):
-    Week.query.update({'is_active': False})
     week = db.get_or_404(Week, week_id)
-    week.is_active = True
+    # One UPDATE: the target week becomes active, every other week inactive
+    Week.query.update({Week.is_active: Week.id == week.id})
     db.session.commit()
     flash(f'Week {week.week_number} is now active!', 'success')
     return redirect(url_for('admin.dashboard'))
@@ -194,11 +195,30 @@ def mark_results(week_id):
     return render_template('admin/mark_results.html', week=week, games=games)
 
 
+def _user_roster():
+    """Column-only rows for the admin roster tables, ordered by lower(username).
+
+    Carries just what the users and payments templates read, including the
+    same display_name fallback as the model property, without ORM hydration.
+    """
+    return db.session.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.lives_remaining,
+            User.is_eliminated,
+            User.is_admin,
+            User.has_paid,
+            func.coalesce(func.nullif(User._display_name, ''), User.username).label('display_name'),
+        ).order_by(func.lower(User.username))
+    ).all()
+
+
 @admin_bp.route('/users')
 @admin_required
 def users():
-    all_users = User.query.order_by(func.lower(User.username)).all()
-    return render_template('admin/users.html', users=all_users)
+    return render_template('admin/users.html', users=_user_roster())
 
 
 @admin_bp.route('/reset-password/<int:user_id>', methods=['POST'])
@@ -242,7 +262,7 @@ def admin_process_autopicks(week_id):
 @admin_bp.route('/payments')
 @admin_required
 def payments():
-    users_list = User.query.order_by(func.lower(User.username)).all()
+    users_list = _user_roster()
     entry_fee = current_app.config.get('ENTRY_FEE', 25)
 
     paid_count = sum(1 for u in users_list if u.has_paid)
@@ -263,12 +283,16 @@ def payments():
 @admin_bp.route('/update-payment/<int:user_id>', methods=['POST'])
 @admin_required
 def update_payment(user_id):
-    user = db.get_or_404(User, user_id)
     data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request body'}), 400
     has_paid = data.get('has_paid', False)
-    user.has_paid = has_paid
+    # Single UPDATE; a missing user shows up as zero rows matched
+    result = db.session.execute(
+        update(User).where(User.id == user_id).values(has_paid=has_paid)
+    )
+    if result.rowcount == 0:
+        abort(404)
     db.session.commit()
     return jsonify({'success': True, 'has_paid': has_paid})
 
@@ -348,7 +372,6 @@ def manage_teams():
 @admin_required
 def fetch_scores(week_id):
     """Fetch scores from API and show review page."""
-    from services.score_fetcher import ScoreFetcher
     fetcher = ScoreFetcher()
     results = fetcher.fetch_scores_for_week(week_id)
 
@@ -14,6 +14,7 @@ from urllib.parse import urlparse
 from extensions import db, limiter
 from models import User, Week
 from timezone_utils import deadline_has_passed
+from services.game_logic import invalidate_standings
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -75,15 +76,17 @@ def register():
             flash('Passwords do not match.', 'error')
             return render_template('register.html')
 
-        existing_username = User.query.filter(
-            func.lower(User.username) == username.casefold()
-        ).first()
-        if existing_username:
+        username_taken = db.session.query(
+            User.query.filter(func.lower(User.username) == username.casefold()).exists()
+        ).scalar()
+        if username_taken:
             flash('That username already exists.', 'error')
             return render_template('register.html')
 
-        existing_email = User.query.filter_by(email=email).first()
-        if existing_email:
+        email_taken = db.session.query(
+            User.query.filter_by(email=email).exists()
+        ).scalar()
+        if email_taken:
             flash('An account already exists for that email.', 'error')
             return render_template('register.html')
 
@@ -97,6 +100,7 @@ def register():
 
         db.session.add(new_user)
         db.session.commit()
+        invalidate_standings()
 
         flash('Registration successful! Please login.', 'success')
         return redirect(url_for('auth.login'))
@@ -113,6 +117,7 @@ def logout():
 
 
 @auth_bp.route('/change-password', methods=['GET', 'POST'])
+@limiter.limit("10 per minute", methods=['POST'])
 @login_required
 def change_password():
     if request.method == 'POST':
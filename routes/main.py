@@ -4,44 +4,40 @@ CF Survivor Pool - Main Routes
 Public/user routes: standings, picks, results.
 """
 
-from collections import defaultdict
+from collections import Counter
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, abort
 from flask_login import login_required, current_user
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
 from extensions import db
 from models import User, Team, Week, Game, Pick
-from constants import TEAM_CONFERENCES
+from constants import TEAM_CONFERENCES, CHAMPIONSHIP_CONFERENCES
 from timezone_utils import (
     get_current_time, get_utc_time, make_aware, deadline_has_passed,
-    to_pool_time, safe_is_after,
+    to_pool_time, safe_is_after, get_pool_now_naive,
 )
 from display_utils import (
     get_week_display_name, get_week_short_label, is_week_playoff,
     get_playoff_teams, get_cfp_eliminated_teams, get_cfp_active_teams,
     get_cfp_teams_on_bye, get_cfp_teams_in_week,
 )
-from services.game_logic import get_used_team_ids, get_game_for_team
+from services.game_logic import (
+    get_active_week, get_used_team_ids, get_games_by_team,
+    get_games_by_week_and_team, get_standings,
+)
 
 main_bp = Blueprint('main', __name__)
 
 
 @main_bp.route('/')
 def index():
-    current_week = Week.query.filter_by(is_active=True).first()
+    current_week = get_active_week()
 
     user_pick = None
     user_pick_spread = None
-    games_by_team = {}
-
-    if current_week:
-        # Bulk-load all games for the current week into a lookup dict
-        for game in Game.query.filter_by(week_id=current_week.id).all():
-            if game.home_team_id:
-                games_by_team[game.home_team_id] = game
-            if game.away_team_id:
-                games_by_team[game.away_team_id] = game
+    games_by_team = get_games_by_team(current_week.id) if current_week else {}
 
     if current_week and current_user.is_authenticated:
         user_pick = Pick.query.filter_by(
@@ -55,11 +51,14 @@ def index():
     week_picks = {}
     show_picks = False
     if current_week:
-        deadline = make_aware(current_week.deadline)
-        show_picks = deadline_has_passed(deadline)
+        show_picks = deadline_has_passed(current_week.deadline)
 
         if show_picks:
-            all_picks = Pick.query.filter_by(week_id=current_week.id).all()
+            all_picks = (
+                Pick.query.options(joinedload(Pick.team))
+                .filter_by(week_id=current_week.id)
+                .all()
+            )
             for pick in all_picks:
                 game = games_by_team.get(pick.team_id)
                 if game:
@@ -68,13 +67,7 @@ def index():
                 else:
                     week_picks[pick.user_id] = pick.team.name
 
-    # Standings sorted by lives desc, spread asc (lower is better)
-    users = User.query.filter_by(is_eliminated=False).order_by(
-        User.lives_remaining.desc(),
-        User.cumulative_spread.asc(),
-    ).all()
-
-    eliminated_users = User.query.filter_by(is_eliminated=True).all()
+    users, eliminated_users = get_standings()
 
     # Championship detection
     champion_picks = []
@@ -84,7 +77,8 @@ def index():
     if len(users) == 1 and len(eliminated_users) > 0:
         champion = users[0]
         champion_picks = (
-            Pick.query.filter_by(user_id=champion.id)
+            Pick.query.options(joinedload(Pick.week), joinedload(Pick.team))
+            .filter_by(user_id=champion.id)
             .join(Week)
             .order_by(Week.week_number)
             .all()
@@ -93,13 +87,9 @@ def index():
         weeks_played = Week.query.filter_by(is_complete=True).count()
 
         # Bulk-load games for all champion pick weeks
-        champion_week_ids = {p.week_id for p in champion_picks}
-        champion_games_by_team = {}
-        for game in Game.query.filter(Game.week_id.in_(champion_week_ids)).all():
-            if game.home_team_id:
-                champion_games_by_team[(game.week_id, game.home_team_id)] = game
-            if game.away_team_id:
-                champion_games_by_team[(game.week_id, game.away_team_id)] = game
+        champion_games_by_team = get_games_by_week_and_team(
+            {p.week_id for p in champion_picks}
+        )
 
         for pick in champion_picks:
             game = champion_games_by_team.get((pick.week_id, pick.team_id))
@@ -145,17 +135,36 @@ def make_pick(week_number):
         user_id=current_user.id, week_id=week.id
     ).first()
 
+    # Load the week's games once; the lock check, POST validation and the
+    # GET eligibility list all read from this
+    games = (
+        Game.query.options(joinedload(Game.home_team), joinedload(Game.away_team))
+        .filter_by(week_id=week.id)
+        .all()
+    )
+    games_by_team = {}
+    # Build team->spread lookup for the dropdown display in the same pass
+    team_spreads = {}
+    for game in games:
+        game._aware_time = make_aware(game.game_time)
+        game._started = safe_is_after(current_time, game._aware_time)
+        if game.home_team_id:
+            games_by_team.setdefault(game.home_team_id, game)
+            team_spreads[game.home_team_id] = game.get_spread_for_team(game.home_team_id)
+        if game.away_team_id:
+            games_by_team.setdefault(game.away_team_id, game)
+            team_spreads[game.away_team_id] = game.get_spread_for_team(game.away_team_id)
+
     pick_locked = False
     if existing_pick:
-        existing_game = get_game_for_team(week.id, existing_pick.team_id)
+        existing_game = games_by_team.get(existing_pick.team_id)
+        if existing_game and existing_game._started:
+            pick_locked = True
 
-        if existing_game and existing_game.game_time:
-            if safe_is_after(current_time, existing_game.game_time):
-                pick_locked = True
+    is_playoff = is_week_playoff(week)
+    cfp_eliminated_names = get_cfp_eliminated_teams() if is_playoff else set()
 
-    cfp_eliminated_names = set()
-    if is_week_playoff(week):
-        cfp_eliminated_names = get_cfp_eliminated_teams()
+    used_team_ids = get_used_team_ids(current_user.id, week)
 
     if request.method == 'POST':
         if pick_locked:
@@ -172,21 +181,17 @@ def make_pick(week_number):
                 flash('Invalid team selection.', 'error')
                 return redirect(url_for('main.make_pick', week_number=week_number))
 
-            new_team_game = get_game_for_team(week.id, team_id)
-
-            if new_team_game and new_team_game.game_time:
-                if safe_is_after(current_time, new_team_game.game_time):
-                    flash('Cannot pick this team - their game has already started.', 'error')
-                    return redirect(url_for('main.make_pick', week_number=week_number))
+            new_team_game = games_by_team.get(team_id)
+            if new_team_game and new_team_game._started:
+                flash('Cannot pick this team - their game has already started.', 'error')
+                return redirect(url_for('main.make_pick', week_number=week_number))
 
-            if is_week_playoff(week) and team.name in cfp_eliminated_names:
+            if is_playoff and team.name in cfp_eliminated_names:
                 flash('Cannot pick this team - they have been eliminated from the playoffs.', 'error')
                 return redirect(url_for('main.make_pick', week_number=week_number))
 
-            used_team_ids = get_used_team_ids(current_user.id, week)
-
             if team_id in used_team_ids:
-                phase_name = "playoff rounds" if is_week_playoff(week) else "previous weeks"
+                phase_name = "playoff rounds" if is_playoff else "previous weeks"
                 flash(f'You have already used this team in {phase_name}.', 'error')
                 return redirect(url_for('main.make_pick', week_number=week_number))
 
@@ -205,48 +210,29 @@ def make_pick(week_number):
                 db.session.add(new_pick)
                 flash('Pick submitted successfully!', 'success')
 
-            current_user.calculate_cumulative_spread()
+            # No spread recompute here: the deadline check above guarantees
+            # this week's pick does not count toward cumulative_spread yet.
             db.session.commit()
 
             return redirect(url_for('main.index'))
 
     # GET: build eligible teams
-    games = Game.query.filter_by(week_id=week.id).all()
-    for game in games:
-        game._aware_time = make_aware(game.game_time)
-
-    used_team_ids = get_used_team_ids(current_user.id, week)
-
     eligible_teams = []
     teams_added = set()
 
+    def _consider(team, spread, started):
+        if not team or started or spread < -16:
+            return
+        if team.id in used_team_ids or team.id in teams_added:
+            return
+        if is_playoff and team.name in cfp_eliminated_names:
+            return
+        eligible_teams.append(team)
+        teams_added.add(team.id)
+
     for game in games:
-        if game.home_team and game.home_team.id not in used_team_ids and game.home_team.id not in teams_added:
-            if is_week_playoff(week) and game.home_team.name in cfp_eliminated_names:
-                continue
-            if game.home_team_spread >= -16:
-                can_pick = not safe_is_after(current_time, game._aware_time)
-                if can_pick:
-                    eligible_teams.append(game.home_team)
-                    teams_added.add(game.home_team.id)
-
-        if game.away_team and game.away_team.id not in used_team_ids and game.away_team.id not in teams_added:
-            if is_week_playoff(week) and game.away_team.name in cfp_eliminated_names:
-                continue
-            away_spread = -game.home_team_spread
-            if away_spread >= -16:
-                can_pick = not safe_is_after(current_time, game._aware_time)
-                if can_pick:
-                    eligible_teams.append(game.away_team)
-                    teams_added.add(game.away_team.id)
-
-    # Build team->spread lookup for the dropdown display
-    team_spreads = {}
-    for game in games:
-        if game.home_team_id:
-            team_spreads[game.home_team_id] = game.get_spread_for_team(game.home_team_id)
-        if game.away_team_id:
-            team_spreads[game.away_team_id] = game.get_spread_for_team(game.away_team_id)
+        _consider(game.home_team, game.home_team_spread, game._started)
+        _consider(game.away_team, -game.home_team_spread, game._started)
 
     return render_template(
         'pick.html',
@@ -264,26 +250,34 @@ def make_pick(week_number):
 @main_bp.route('/my-picks')
 @login_required
 def my_picks():
-    current_week = Week.query.filter_by(is_active=True).first()
-    in_cfp = current_week and is_week_playoff(current_week)
+    current_week = get_active_week()
+    in_cfp = bool(current_week and is_week_playoff(current_week))
 
     user_picks = (
-        Pick.query.filter_by(user_id=current_user.id)
+        Pick.query.options(joinedload(Pick.week), joinedload(Pick.team))
+        .filter_by(user_id=current_user.id)
         .join(Week)
         .order_by(Week.week_number)
         .all()
     )
 
+    games_by_week_team = get_games_by_week_and_team({p.week_id for p in user_picks})
+
+    relevant_picks = []
     for pick in user_picks:
+        pick_is_playoff = bool(is_week_playoff(pick.week))
+        if pick_is_playoff == in_cfp:
+            relevant_picks.append(pick)
+
         pick.week_display = {
             'display_name': get_week_display_name(pick.week),
             'short_label': get_week_short_label(pick.week),
-            'badge_type': 'playoff' if is_week_playoff(pick.week) else (
+            'badge_type': 'playoff' if pick_is_playoff else (
                 'conference' if pick.week.week_number == 15 else None
             ),
         }
 
-        game = get_game_for_team(pick.week_id, pick.team_id)
+        game = games_by_week_team.get((pick.week_id, pick.team_id))
         if game:
             pick.spread_data = {'team_spread': game.get_spread_for_team(pick.team_id)}
         else:
@@ -291,14 +285,10 @@ def my_picks():
 
     all_teams = Team.query.order_by(Team.name).all()
 
-    if in_cfp:
-        relevant_picks = [p for p in user_picks if is_week_playoff(p.week)]
-        phase_description = "CFP Phase"
-    else:
-        relevant_picks = [p for p in user_picks if not is_week_playoff(p.week)]
-        phase_description = "Regular Season"
+    phase_description = "CFP Phase" if in_cfp else "Regular Season"
 
-    used_team_ids = {pick.team_id for pick in relevant_picks}
+    # Earliest pick wins if a team somehow appears twice in the phase
+    picks_by_team = {pick.team_id: pick for pick in reversed(relevant_picks)}
 
     used_teams = []
     available_teams = []
@@ -315,16 +305,14 @@ def my_picks():
         for team in all_teams:
             if team.name not in playoff_team_names:
                 continue
-            if team.id in used_team_ids:
-                for pick in relevant_picks:
-                    if pick.team_id == team.id:
-                        used_teams.append({
-                            'team': team,
-                            'week': pick.week.week_number,
-                            'week_display': pick.week_display['display_name'],
-                            'is_correct': pick.is_correct,
-                        })
-                        break
+            pick = picks_by_team.get(team.id)
+            if pick:
+                used_teams.append({
+                    'team': team,
+                    'week': pick.week.week_number,
+                    'week_display': pick.week_display['display_name'],
+                    'is_correct': pick.is_correct,
+                })
             elif team.name in eliminated_names:
                 cfp_eliminated_teams.append(team)
             elif team.name not in teams_playing_this_week:
@@ -332,18 +320,15 @@ def my_picks():
             else:
                 available_teams.append(team)
     else:
-        playoff_team_names = get_playoff_teams()
         for team in all_teams:
-            if team.id in used_team_ids:
-                for pick in relevant_picks:
-                    if pick.team_id == team.id:
-                        used_teams.append({
-                            'team': team,
-                            'week': pick.week.week_number,
-                            'week_display': pick.week_display['display_name'],
-                            'is_correct': pick.is_correct,
-                        })
-                        break
+            pick = picks_by_team.get(team.id)
+            if pick:
+                used_teams.append({
+                    'team': team,
+                    'week': pick.week.week_number,
+                    'week_display': pick.week_display['display_name'],
+                    'is_correct': pick.is_correct,
+                })
             else:
                 available_teams.append(team)
                 conference = TEAM_CONFERENCES.get(team.name, 'Unknown')
@@ -351,40 +336,35 @@ def my_picks():
                     teams_by_conference[conference] = []
                 teams_by_conference[conference].append(team)
 
-    all_conferences = set()
     conferences_with_teams = 0
     conference_status = {}
     conference_warnings = []
+    total_conferences = 0
 
     if not in_cfp:
-        for conf in TEAM_CONFERENCES.values():
-            if conf != 'Independent':
-                all_conferences.add(conf)
-
-        for conf in sorted(all_conferences):
-            team_count = len(teams_by_conference.get(conf, []))
+        total_conferences = len(CHAMPIONSHIP_CONFERENCES)
+        for conf in CHAMPIONSHIP_CONFERENCES:
+            conf_teams = teams_by_conference.get(conf, ())
+            team_count = len(conf_teams)
             conference_status[conf] = {'count': team_count}
+            if team_count == 1:
+                conference_warnings.append(f"Only {conf_teams[0].name} remaining for {conf} championship")
+            elif team_count == 0:
+                conference_warnings.append(f"No teams available for {conf} championship")
             if team_count > 0:
                 conferences_with_teams += 1
-            if conf != 'Independent':
-                if team_count == 1:
-                    team_name = teams_by_conference[conf][0].name
-                    conference_warnings.append(f"Only {team_name} remaining for {conf} championship")
-                elif team_count == 0:
-                    conference_warnings.append(f"No teams available for {conf} championship")
 
     total_picks = len(user_picks)
     correct_picks = sum(1 for p in user_picks if p.is_correct is True)
     incorrect_picks = sum(1 for p in user_picks if p.is_correct is False)
     pending_picks = sum(1 for p in user_picks if p.is_correct is None)
-    total_conferences = len(all_conferences)
 
     current_week_display = None
     if current_week:
         current_week_display = {
             'display_name': get_week_display_name(current_week),
             'short_label': get_week_short_label(current_week),
-            'badge_type': 'playoff' if is_week_playoff(current_week) else (
+            'badge_type': 'playoff' if in_cfp else (
                 'conference' if current_week.week_number == 15 else None
             ),
             'progress_text': get_week_display_name(current_week),
@@ -416,14 +396,10 @@ def my_picks():
 @main_bp.route('/weekly_results')
 @main_bp.route('/results/week/<int:week_number>')
 def weekly_results(week_number=None):
-    current_time = get_current_time()
+    now_naive = get_pool_now_naive()
 
     all_weeks = Week.query.order_by(Week.week_number).all()
-    viewable_weeks = []
-    for w in all_weeks:
-        deadline = make_aware(w.deadline)
-        if deadline_has_passed(deadline):
-            viewable_weeks.append(w)
+    viewable_weeks = [w for w in all_weeks if now_naive > w.deadline]
 
     if week_number is None:
         if viewable_weeks:
@@ -432,10 +408,12 @@ def weekly_results(week_number=None):
             flash('No weekly results available yet. Check back after the first week deadline.', 'info')
             return redirect(url_for('main.index'))
 
-    week = Week.query.filter_by(week_number=week_number).first_or_404()
-    deadline = make_aware(week.deadline)
+    # Reuse the week list already loaded above instead of querying again
+    week = next((w for w in all_weeks if w.week_number == week_number), None)
+    if week is None:
+        abort(404)
 
-    if current_time <= deadline:
+    if now_naive <= week.deadline:
         flash(
             f'Week {week_number} results will be available after the deadline: '
             f'{week.deadline.strftime("%B %d at %I:%M %p")}',
@@ -444,7 +422,8 @@ def weekly_results(week_number=None):
         return redirect(url_for('main.index'))
 
     picks = (
-        Pick.query.filter_by(week_id=week.id)
+        Pick.query.options(joinedload(Pick.user), joinedload(Pick.team))
+        .filter_by(week_id=week.id)
         .join(User)
         .order_by(func.lower(User.username))
         .all()
@@ -453,7 +432,11 @@ def weekly_results(week_number=None):
         pick._pool_created_at = to_pool_time(pick.created_at)
         pick.is_autopick = safe_is_after(pick._pool_created_at, week.deadline)
 
-    games = Game.query.filter_by(week_id=week.id).all()
+    games = (
+        Game.query.options(joinedload(Game.home_team), joinedload(Game.away_team))
+        .filter_by(week_id=week.id)
+        .all()
+    )
     game_results = {}
     for game in games:
         if game.home_team:
@@ -483,41 +466,45 @@ def weekly_results(week_number=None):
     incorrect_picks_list = [p for p in picks if p.is_correct is False]
     pending_picks_list = [p for p in picks if p.is_correct is None]
 
-    # Bulk-load all picks up to the current week to avoid N+1 queries
-    all_past_picks = (
-        Pick.query.join(Week)
-        .filter(Week.week_number <= week.week_number)
-        .order_by(Week.week_number)
+    # Running loss count per user up to this week, computed by the database.
+    # Only losing picks are fetched; users without a loss simply have no rows.
+    running_losses = func.count().over(
+        partition_by=Pick.user_id, order_by=Week.week_number,
+    )
+    loss_rows = (
+        db.session.query(Pick.user_id, Week.week_number, running_losses)
+        .join(Week)
+        .filter(
+            Week.week_number <= week.week_number,
+            Pick.is_correct == False,  # noqa: E712
+        )
+        .order_by(Pick.user_id, Week.week_number)
         .all()
     )
-    picks_by_user = defaultdict(list)
-    for p in all_past_picks:
-        picks_by_user[p.user_id].append(p)
+    losses_by_user = {}
+    eliminated_week_by_user = {}
+    for user_id, past_week_number, losses in loss_rows:
+        losses_by_user[user_id] = losses
+        if losses >= 2:
+            eliminated_week_by_user.setdefault(user_id, past_week_number)
 
     user_statuses = {}
     for user in all_users:
-        lives = 2
-        eliminated_week = None
-        for past_pick in picks_by_user.get(user.id, []):
-            if past_pick.is_correct is False:
-                lives -= 1
-                if lives <= 0:
-                    eliminated_week = past_pick.week.week_number
-                    lives = 0
-                    break
+        lives = max(0, 2 - losses_by_user.get(user.id, 0))
         user_statuses[user.id] = {
             'lives': lives,
             'is_eliminated': lives == 0,
-            'eliminated_week': eliminated_week,
+            'eliminated_week': eliminated_week_by_user.get(user.id),
         }
 
+    # Every user has an entry, so index directly rather than .get() with a default
     for pick in picks:
-        status = user_statuses.get(pick.user_id, {'lives': 2, 'is_eliminated': False})
+        status = user_statuses[pick.user_id]
         pick.lives_after = status['lives']
         pick.was_eliminated = status['is_eliminated']
 
     for user in users_no_pick:
-        status = user_statuses.get(user.id, {'lives': 2, 'is_eliminated': False})
+        status = user_statuses[user.id]
         user.lives_after = status['lives']
         user.was_eliminated = status['is_eliminated']
 
@@ -534,7 +521,6 @@ def weekly_results(week_number=None):
         )
 
     # Build pick distribution counts for template
-    from collections import Counter
     pick_counts = Counter(pick.team.name for pick in picks)
 
     return render_template(
@@ -15,7 +15,7 @@ if BASE_DIR not in sys.path:
 os.environ.setdefault('ENVIRONMENT', 'production')
 
 from app import create_app
-from services.game_logic import check_and_process_autopicks
+from services.game_logic import check_and_process_autopicks, refresh_cumulative_spreads
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +33,8 @@ def main() -> None:
                     logger.info("  %s", entry)
             else:
                 logger.info("No auto-picks were required.")
+            refreshed = refresh_cumulative_spreads()
+            logger.info("Cumulative spreads refreshed for %d users.", refreshed)
         except Exception:
             logger.exception("Auto-pick processing failed")
             raise
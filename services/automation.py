@@ -15,7 +15,7 @@ import requests
 from flask import current_app
 
 from extensions import db
-from models import Team, Week, Game
+from models import User, Team, Week, Game, Pick
 from constants import (
     API_BASE_URL, TEAM_NAME_MAP, SEASON_SCHEDULE,
 )
@@ -172,8 +172,7 @@ def run_setup():
         }
 
     # Activate the week (deactivate others)
-    Week.query.update({'is_active': False})
-    existing.is_active = True
+    Week.query.update({Week.is_active: Week.id == existing.id})
     db.session.commit()
 
     return {
@@ -361,8 +360,6 @@ def run_status():
     """
     weeks = Week.query.order_by(Week.week_number).all()
     active_week = Week.query.filter_by(is_active=True).first()
-
-    from models import User, Pick
     total_users = User.query.count()
     active_users = User.query.filter_by(is_eliminated=False).count()
 
@@ -5,14 +5,17 @@ Core business logic: result processing, auto-picks, team eligibility.
 """
 
 import logging
+import time
+from collections import defaultdict, namedtuple
 
-from flask import current_app
-from sqlalchemy import func
+from flask import current_app, g
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import joinedload
 
 from extensions import db
 from models import User, Team, Week, Game, Pick
 from timezone_utils import (
-    get_current_time, get_utc_time, make_aware, deadline_has_passed,
+    get_utc_time, make_aware, deadline_has_passed, get_pool_now_naive,
 )
 from display_utils import is_week_playoff, get_cfp_eliminated_teams
 
@@ -23,29 +26,160 @@ logger = logging.getLogger(__name__)
 # Team eligibility (consolidates the duplicated logic from app.py)
 # ---------------------------------------------------------------------------
 
-def get_game_for_team(week_id, team_id):
-    """Return the Game in this week that involves the given team."""
-    return Game.query.filter_by(week_id=week_id).filter(
-        db.or_(Game.home_team_id == team_id, Game.away_team_id == team_id)
-    ).first()
-
-
-def get_used_team_ids(user_id, week, *, exclude_current=True):
-    """Return set of team IDs the user has already picked in the current phase."""
-    q = db.session.query(Pick.team_id).join(Week)
-
+def get_games_by_team(week_id):
+    """Return {team_id: Game} for every team playing this week, in one query."""
+    games_by_team = {}
+    for game in Game.query.filter_by(week_id=week_id).all():
+        if game.home_team_id:
+            games_by_team[game.home_team_id] = game
+        if game.away_team_id:
+            games_by_team[game.away_team_id] = game
+    return games_by_team
+
+
+def get_games_by_week_and_team(week_ids):
+    """Return {(week_id, team_id): Game} across several weeks, in one query."""
+    games = {}
+    if not week_ids:
+        return games
+    for game in Game.query.filter(Game.week_id.in_(week_ids)).all():
+        if game.home_team_id:
+            games[(game.week_id, game.home_team_id)] = game
+        if game.away_team_id:
+            games[(game.week_id, game.away_team_id)] = game
+    return games
+
+
+def get_active_week():
+    """Return the active Week, queried at most once per request via flask.g."""
+    if 'active_week' not in g:
+        g.active_week = Week.query.filter_by(is_active=True).first()
+    return g.active_week
+
+
+def _phase_picks_filter(q, week, exclude_current):
+    """Restrict a Pick query (joined to Week) to the week's phase."""
     if is_week_playoff(week):
         q = q.filter(Week.is_playoff_week == True)
     else:
         q = q.filter(Week.is_playoff_week == False)
 
-    q = q.filter(Pick.user_id == user_id)
     if exclude_current:
         q = q.filter(Pick.week_id != week.id)
+    return q
+
 
+def get_used_team_ids(user_id, week, *, exclude_current=True):
+    """Return set of team IDs the user has already picked in the current phase."""
+    q = db.session.query(Pick.team_id).join(Week).filter(Pick.user_id == user_id)
+    q = _phase_picks_filter(q, week, exclude_current)
     return {t[0] for t in q.all()}
 
 
+def get_used_team_ids_by_user(user_ids, week, *, exclude_current=True):
+    """Return {user_id: set of used team IDs} for many users in one query."""
+    used_by_user = defaultdict(set)
+    if not user_ids:
+        return used_by_user
+    q = db.session.query(Pick.user_id, Pick.team_id).join(Week).filter(
+        Pick.user_id.in_(user_ids)
+    )
+    for user_id, team_id in _phase_picks_filter(q, week, exclude_current):
+        used_by_user[user_id].add(team_id)
+    return used_by_user
+
+
+# ---------------------------------------------------------------------------
+# Standings
+# ---------------------------------------------------------------------------
+
+STANDINGS_TTL_SECONDS = 30
+
+StandingsEntry = namedtuple(
+    'StandingsEntry', ['id', 'display_name', 'lives_remaining', 'cumulative_spread'],
+)
+
+_standings_cache = {'expires': 0.0, 'value': None}
+
+
+def get_standings():
+    """Return (active, eliminated) standings entries, cached for a short TTL.
+
+    Active users are sorted by lives desc, spread asc (lower is better).
+    Entries are plain tuples so they can outlive the request's session.
+    """
+    now = time.monotonic()
+    if _standings_cache['value'] is not None and now < _standings_cache['expires']:
+        return _standings_cache['value']
+
+    def _entry(user):
+        return StandingsEntry(
+            user.id, user.display_name, user.lives_remaining, user.cumulative_spread,
+        )
+
+    # One pass over the table: active users first in ranking order, then
+    # eliminated users in signup (id) order.
+    active, eliminated = [], []
+    for u in User.query.order_by(
+        User.is_eliminated.asc(),
+        case((User.is_eliminated, User.id)),
+        User.lives_remaining.desc(),
+        User.cumulative_spread.asc(),
+    ):
+        (eliminated if u.is_eliminated else active).append(_entry(u))
+
+    _standings_cache['value'] = (active, eliminated)
+    _standings_cache['expires'] = now + STANDINGS_TTL_SECONDS
+    return active, eliminated
+
+
+def invalidate_standings():
+    """Drop the cached standings after lives, spreads, or membership change."""
+    _standings_cache['value'] = None
+
+
+def _update_cumulative_spreads(user_ids=None):
+    """Recompute cumulative_spread for users in one UPDATE (no commit).
+
+    This is the tiebreaker rule: only picks whose week deadline has passed
+    count, favorites add and underdogs subtract, which is the negated spread
+    from the picked team's perspective either way. Pass user_ids to limit
+    the update; None updates every user.
+    """
+    now = get_pool_now_naive()
+    total = (
+        select(func.coalesce(func.sum(case(
+            (Pick.team_id == Game.home_team_id, -Game.home_team_spread),
+            else_=Game.home_team_spread,
+        )), 0.0))
+        .select_from(Pick)
+        .join(Week, Pick.week_id == Week.id)
+        .join(Game, db.and_(
+            Game.week_id == Pick.week_id,
+            db.or_(Game.home_team_id == Pick.team_id, Game.away_team_id == Pick.team_id),
+        ))
+        .where(Pick.user_id == User.id, Week.deadline < now)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    stmt = update(User).values(cumulative_spread=total)
+    if user_ids is not None:
+        stmt = stmt.where(User.id.in_(user_ids))
+    return db.session.execute(stmt, execution_options={'synchronize_session': 'fetch'}).rowcount
+
+
+def refresh_cumulative_spreads():
+    """Recompute and commit every user's cumulative spread.
+
+    Picks start counting once their week's deadline passes, which no
+    request observes; run this from the autopick cron as a safety net.
+    """
+    updated = _update_cumulative_spreads()
+    db.session.commit()
+    invalidate_standings()
+    return updated
+
+
 # ---------------------------------------------------------------------------
 # Result processing
 # ---------------------------------------------------------------------------
@@ -61,65 +195,89 @@ def process_week_results(week_id):
         return {"success": False, "error": f"Week {week_id} not found"}
 
     try:
-        picks = Pick.query.filter_by(week_id=week_id).all()
-
-        # Track active users who had 1 life at START of week (for revival rule)
-        active_users = User.query.filter_by(is_eliminated=False).all()
-        users_with_one_life_before = [
-            user.id for user in active_users if user.lives_remaining == 1
+        # Active users who had 1 life at START of week (for revival rule)
+        one_lifer_ids = [
+            user_id for (user_id,) in db.session.query(User.id).filter(
+                User.is_eliminated == False,  # noqa: E712
+                User.lives_remaining == 1,
+            )
         ]
 
-        # Bulk-load decided games into a team-keyed lookup to avoid N queries
-        decided_games = Game.query.filter(
-            Game.week_id == week_id,
+        # The decided game a pick's team played in, correlated to the pick row
+        pick_game = db.and_(
+            Game.week_id == Pick.week_id,
             Game.home_team_won != None,  # noqa: E711
-        ).all()
-        games_by_team = {}
-        for game in decided_games:
-            if game.home_team_id:
-                games_by_team[game.home_team_id] = game
-            if game.away_team_id:
-                games_by_team[game.away_team_id] = game
-
-        for pick in picks:
-            game = games_by_team.get(pick.team_id)
-
-            if game:
-                pick.is_correct = (
-                    game.home_team_won if pick.team_id == game.home_team_id
-                    else not game.home_team_won
-                )
-
-                if not pick.is_correct:
-                    user = pick.user
-                    user.lives_remaining -= 1
-                    if user.lives_remaining <= 0:
-                        user.is_eliminated = True
-                        user.lives_remaining = 0
-
-            pick.user.calculate_cumulative_spread()
-
-        db.session.commit()
+            db.or_(Game.home_team_id == Pick.team_id, Game.away_team_id == Pick.team_id),
+        )
+        has_result = select(Game.id).where(pick_game).correlate(Pick).exists()
+        outcome = (
+            select(case(
+                (Game.home_team_id == Pick.team_id, Game.home_team_won),
+                else_=db.not_(Game.home_team_won),
+            ))
+            .where(pick_game)
+            .limit(1)
+            .correlate(Pick)
+            .scalar_subquery()
+        )
+
+        # Set-based: mark every decided pick, then charge a life to each loser.
+        # The commit below expires the session, so no in-memory sync is needed.
+        no_sync = {'synchronize_session': False}
+        db.session.execute(
+            update(Pick)
+            .where(Pick.week_id == week_id, has_result)
+            .values(is_correct=outcome),
+            execution_options=no_sync,
+        )
+
+        losers = select(Pick.user_id).where(
+            Pick.week_id == week_id,
+            Pick.is_correct == False,  # noqa: E712
+            has_result,
+        )
+        lives_left = User.lives_remaining - 1
+        db.session.execute(
+            update(User)
+            .where(User.id.in_(losers))
+            .values(
+                lives_remaining=case((lives_left <= 0, 0), else_=lives_left),
+                is_eliminated=case((lives_left <= 0, True), else_=User.is_eliminated),
+            ),
+            execution_options=no_sync,
+        )
 
         # Revival rule: if ALL users who had 1 life before this week lost, revive them
         revived = 0
-        if users_with_one_life_before:
-            one_lifers = User.query.filter(
-                User.id.in_(users_with_one_life_before)
+        if one_lifer_ids:
+            lives_now = db.session.query(User.lives_remaining).filter(
+                User.id.in_(one_lifer_ids)
             ).all()
-            if all(u.lives_remaining == 0 for u in one_lifers):
-                for user in one_lifers:
-                    user.lives_remaining = 1
-                    user.is_eliminated = False
-                db.session.commit()
-                revived = len(one_lifers)
-                logger.info(
-                    "REVIVAL RULE ACTIVATED: Week %s - %d users revived",
-                    week.week_number,
-                    revived,
+            if all(lives == 0 for (lives,) in lives_now):
+                db.session.execute(
+                    update(User)
+                    .where(User.id.in_(one_lifer_ids))
+                    .values(lives_remaining=1, is_eliminated=False),
+                    execution_options=no_sync,
                 )
+                revived = len(one_lifer_ids)
+
+        processed = Pick.query.filter_by(week_id=week_id).count()
+        if processed:
+            _update_cumulative_spreads(
+                select(Pick.user_id).where(Pick.week_id == week_id)
+            )
+        db.session.commit()
 
-        return {"success": True, "processed": len(picks), "revived": revived}
+        if revived:
+            logger.info(
+                "REVIVAL RULE ACTIVATED: Week %s - %d users revived",
+                week.week_number,
+                revived,
+            )
+
+        invalidate_standings()
+        return {"success": True, "processed": processed, "revived": revived}
 
     except Exception:
         db.session.rollback()
@@ -140,8 +298,9 @@ def process_autopicks(week_id):
         return {"processed": False, "reason": "Deadline not yet passed"}
 
     active_users = User.query.filter_by(is_eliminated=False).all()
-    existing_picks = Pick.query.filter_by(week_id=week_id).all()
-    users_with_picks = {pick.user_id for pick in existing_picks}
+    users_with_picks = {
+        user_id for (user_id,) in db.session.query(Pick.user_id).filter_by(week_id=week_id)
+    }
 
     users_needing_autopick = [
         u for u in active_users if u.id not in users_with_picks
@@ -153,80 +312,60 @@ def process_autopicks(week_id):
     autopicks_made = []
     autopicks_failed = []
 
-    current_time = get_current_time()
-    games = [
-        g for g in Game.query.filter_by(week_id=week_id).all()
-        if not g.game_time or make_aware(g.game_time) > current_time
-    ]
-
-    cfp_eliminated_names = set()
-    if is_week_playoff(week):
-        cfp_eliminated_names = get_cfp_eliminated_teams()
+    # Only games that have not kicked off
+    games = Game.query.options(
+        joinedload(Game.home_team), joinedload(Game.away_team),
+    ).filter(
+        Game.week_id == week_id,
+        db.or_(
+            Game.game_time == None,  # noqa: E711
+            Game.game_time > get_pool_now_naive(),
+        ),
+    ).all()
+
+    is_playoff = is_week_playoff(week)
+    cfp_eliminated_names = get_cfp_eliminated_teams() if is_playoff else frozenset()
+
+    used_by_user = get_used_team_ids_by_user([u.id for u in users_needing_autopick], week)
+
+    # Game data is the same for every user: rank candidates once, then each
+    # user takes the first one they have not used. Sorting is stable, so
+    # ties keep game order (home before away), as the old scans did.
+    candidates = []
+    for game in games:
+        for team, team_spread in (
+            (game.home_team, game.home_team_spread),
+            (game.away_team, -game.home_team_spread),
+        ):
+            if not team or (is_playoff and team.name in cfp_eliminated_names):
+                continue
+            candidates.append((team, team_spread))
+
+    # Biggest favorite within the 16-point cap first; else smallest underdog
+    favorites = sorted((c for c in candidates if -16 <= c[1] < 0), key=lambda c: c[1])
+    underdogs = sorted((c for c in candidates if c[1] > 0), key=lambda c: c[1])
+
+    new_picks = []
+    pick_time = get_utc_time()
 
     for user in users_needing_autopick:
-        used_team_ids = get_used_team_ids(user.id, week)
-
-        best_team = None
-        best_spread = None
-        best_favoritism = -999
-
-        for game in games:
-            # Check home team
-            if game.home_team and game.home_team_id not in used_team_ids:
-                if is_week_playoff(week) and game.home_team.name in cfp_eliminated_names:
-                    continue
-                home_favoritism = -game.home_team_spread
-                if 0 < home_favoritism <= 16:
-                    if home_favoritism > best_favoritism:
-                        best_favoritism = home_favoritism
-                        best_spread = game.home_team_spread
-                        best_team = game.home_team
-
-            # Check away team
-            if game.away_team and game.away_team_id not in used_team_ids:
-                if is_week_playoff(week) and game.away_team.name in cfp_eliminated_names:
-                    continue
-                away_favoritism = game.home_team_spread
-                if 0 < away_favoritism <= 16:
-                    if away_favoritism > best_favoritism:
-                        best_favoritism = away_favoritism
-                        best_spread = -game.home_team_spread
-                        best_team = game.away_team
-
-        # Fallback: pick the smallest underdog
+        used_team_ids = used_by_user[user.id]
+
+        best_team, best_spread = next(
+            (c for c in favorites if c[0].id not in used_team_ids), (None, None)
+        )
         if not best_team:
-            smallest_underdog = None
-            smallest_underdog_points = 999
-
-            for game in games:
-                if game.home_team and game.home_team_id not in used_team_ids:
-                    if is_week_playoff(week) and game.home_team.name in cfp_eliminated_names:
-                        continue
-                    if game.home_team_spread > 0 and game.home_team_spread < smallest_underdog_points:
-                        smallest_underdog_points = game.home_team_spread
-                        smallest_underdog = game.home_team
-                        best_spread = game.home_team_spread
-
-                if game.away_team and game.away_team_id not in used_team_ids:
-                    if is_week_playoff(week) and game.away_team.name in cfp_eliminated_names:
-                        continue
-                    away_spread = -game.home_team_spread
-                    if away_spread > 0 and away_spread < smallest_underdog_points:
-                        smallest_underdog_points = away_spread
-                        smallest_underdog = game.away_team
-                        best_spread = away_spread
-
-            best_team = smallest_underdog
+            best_team, best_spread = next(
+                (c for c in underdogs if c[0].id not in used_team_ids), (None, None)
+            )
 
         if best_team:
-            auto_pick = Pick(
+            new_picks.append(Pick(
                 user_id=user.id,
                 week_id=week_id,
                 team_id=best_team.id,
-                created_at=get_utc_time(),
-            )
-            db.session.add(auto_pick)
-            user.calculate_cumulative_spread()
+                created_at=pick_time,
+            ))
 
             if best_spread and best_spread < 0:
                 favoritism_text = f"favored by {-best_spread} points"
@@ -249,8 +388,12 @@ def process_autopicks(week_id):
             })
             logger.warning("Auto-pick failed: %s - No eligible teams", user.username)
 
-    if autopicks_made:
+    # Write every auto-pick and the affected spreads in one transaction
+    if new_picks:
+        db.session.add_all(new_picks)
+        _update_cumulative_spreads([pick.user_id for pick in new_picks])
         db.session.commit()
+        invalidate_standings()
 
     return {
         "processed": True,
@@ -263,14 +406,13 @@ def process_autopicks(week_id):
 
 def check_and_process_autopicks():
     """Check all active weeks and process autopicks if past deadline."""
-    weeks = Week.query.filter_by(is_complete=False).all()
+    now = get_pool_now_naive()
+    weeks = Week.query.filter(Week.is_complete == False, Week.deadline < now).all()  # noqa: E712
     results = []
     for week in weeks:
-        deadline = make_aware(week.deadline)
-        if deadline_has_passed(deadline):
-            result = process_autopicks(week.id)
-            if result["processed"] and result["autopicks"] > 0:
-                results.append(
-                    f"Week {week.week_number}: {result['autopicks']} auto-picks made"
-                )
+        result = process_autopicks(week.id)
+        if result["processed"] and result["autopicks"] > 0:
+            results.append(
+                f"Week {week.week_number}: {result['autopicks']} auto-picks made"
+            )
     return results
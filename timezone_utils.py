@@ -7,14 +7,24 @@ from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 import os
 
+from flask import g, has_request_context
+
 # Get the pool's timezone from environment or default to Chicago
 POOL_TZ_NAME = os.getenv('POOL_TIMEZONE', 'America/Chicago')
 POOL_TZ = ZoneInfo(POOL_TZ_NAME)
 UTC_TZ = timezone.utc
 
 def get_current_time():
-    """Get current time in the pool's timezone (aware)"""
-    return datetime.now(POOL_TZ)
+    """Get current time in the pool's timezone (aware)
+
+    Inside a request the first reading is kept on flask.g, so every deadline
+    check during that request compares against the same instant.
+    """
+    if not has_request_context():
+        return datetime.now(POOL_TZ)
+    if 'pool_now' not in g:
+        g.pool_now = datetime.now(POOL_TZ)
+    return g.pool_now
 
 def get_utc_time():
     """Get current UTC time (aware)"""
@@ -49,6 +59,15 @@ def deadline_has_passed(deadline):
     current = get_current_time()
     return current > deadline_aware
 
+def get_pool_now_naive():
+    """Current pool time without tzinfo, for comparing against stored columns.
+
+    Week deadlines and game times are stored as naive datetimes in pool
+    (Central) time, so this value can be compared with them directly, in
+    Python or in SQL filters.
+    """
+    return get_current_time().replace(tzinfo=None)
+
 def format_deadline(deadline):
     """Format deadline for display in pool timezone"""
     if deadline is None: